@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Callable, Iterable, Optional
+from collections import deque
 import operator
 
 Val = int
@@ -16,25 +17,30 @@ class Constraint:
     scope: Tuple[str, ...]
     pred: Callable[[Assignment], bool]
     pretty: str
+    kind: str = ""   # set by the builders below; "" means an opaque predicate
+
+# c_bin kinds are only known when op is one of these (not an arbitrary lambda)
+BIN_KINDS = {operator.eq: "eq", operator.ne: "neq", operator.lt: "lt",
+             operator.le: "le", operator.gt: "gt", operator.ge: "ge"}
 
 # ---------- Constraint builders ----------
 def c_alldiff(vars: List[str]) -> Constraint:
     def pred(a: Assignment) -> bool:
         vals = [a[v] for v in vars if v in a]
         return len(vals) == len(set(vals))
-    return Constraint(tuple(vars), pred, f"alldiff({','.join(vars)})")
+    return Constraint(tuple(vars), pred, f"alldiff({','.join(vars)})", "alldiff")
 
 def c_bin(op: Callable[[int,int], bool], x: str, y: str, opname: str) -> Constraint:
     def pred(a: Assignment) -> bool:
         if x in a and y in a:
             return op(a[x], a[y])
         return True
-    return Constraint((x,y), pred, f"{opname}({x},{y})")
+    return Constraint((x,y), pred, f"{opname}({x},{y})", BIN_KINDS.get(op, ""))
 
 def c_in(x: str, allowed: List[int]) -> Constraint:
     def pred(a: Assignment) -> bool:
         return (x not in a) or (a[x] in allowed)
-    return Constraint((x,), pred, f"in({x},{allowed})")
+    return Constraint((x,), pred, f"in({x},{allowed})", "in")
 
 def c_sum(vars: List[str], opstr: str, k: int) -> Constraint:
     opmap = {"==": operator.eq, "!=": operator.ne, "<=": operator.le,
@@ -46,7 +52,7 @@ def c_sum(vars: List[str], opstr: str, k: int) -> Constraint:
         if not all(v in a for v in vars):
             return True
         return opf(sum(a[v] for v in vars), k)
-    return Constraint(tuple(vars), pred, f"sum({vars}) {opstr} {k}")
+    return Constraint(tuple(vars), pred, f"sum({vars}) {opstr} {k}", "sum")
 
 def c_table(vars: List[str], allowed: List[Tuple[int, ...]]) -> Constraint:
     allowed_set = set(tuple(t) for t in allowed)
@@ -55,7 +61,7 @@ def c_table(vars: List[str], allowed: List[Tuple[int, ...]]) -> Constraint:
             tup = tuple(a[v] for v in vars)
             return tup in allowed_set
         return True
-    return Constraint(tuple(vars), pred, f"table({vars}) allowed {allowed}")
+    return Constraint(tuple(vars), pred, f"table({vars}) allowed {allowed}", "table")
 
 def c_add10(x: str, y: str, cin: str, z: str, cout: str) -> Constraint:
     """Digit-wise base-10 addition: x + y + cin = 10*cout + z, where cin, cout in {0,1} and x,y,z in 0..9.
@@ -66,10 +72,31 @@ def c_add10(x: str, y: str, cin: str, z: str, cout: str) -> Constraint:
         if all(v in a for v in scope):
             return (a[x] + a[y] + a[cin]) == 10 * a[cout] + a[z]
         return True
-    return Constraint(scope, pred, f"add10({x},{y},{cin}->{z},{cout})")
+    return Constraint(scope, pred, f"add10({x},{y},{cin}->{z},{cout})", "add10")
+
+def c_precede(vars: List[str], values: List[int]) -> Constraint:
+    """Value precedence: each values[i+1] may only appear after some earlier var took values[i].
+       Only enforced on a fully assigned prefix of vars.
+    """
+    rank = {val: i for i, val in enumerate(values)}
+    def pred(a: Assignment) -> bool:
+        seen = set()
+        prefix_done = True
+        for v in vars:
+            if v not in a:
+                prefix_done = False
+                continue
+            i = rank.get(a[v])
+            if i and prefix_done and values[i-1] not in seen:
+                return False
+            seen.add(a[v])
+        return True
+    return Constraint(tuple(vars), pred, f"precede({vars},{values})", "precede")
 
 # ---------- Simple solver (BT + forward checking) ----------
-def solve_backtracking(csp: CSP, var_order: Optional[List[str]]=None) -> Iterable[Assignment]:
+def solve_backtracking(csp: CSP, var_order: Optional[List[str]]=None,
+                       value_hint: Optional[Assignment]=None) -> Iterable[Assignment]:
+    """value_hint (e.g. a previous solution) is tried first for each variable that has it."""
     domains = {v: list(ds) for v, ds in csp.domains.items()}
     order = var_order or list(domains.keys())
     cons_by_var: Dict[str, List[Constraint]] = {v: [] for v in domains}
@@ -79,6 +106,13 @@ def solve_backtracking(csp: CSP, var_order: Optional[List[str]]=None) -> Iterabl
                 cons_by_var[v].append(c)
 
     assignment: Assignment = {}
+    hint = value_hint or {}
+
+    def ordered_values(v: str) -> List[Val]:
+        vals = list(domains[v])
+        if v in hint and hint[v] in vals:
+            vals.remove(hint[v]); vals.insert(0, hint[v])
+        return vals
 
     def consistent_with_local(v: str, a: Assignment) -> bool:
         for c in cons_by_var[v]:
@@ -91,7 +125,7 @@ def solve_backtracking(csp: CSP, var_order: Optional[List[str]]=None) -> Iterabl
             yield dict(assignment)
             return
         v = order[idx]
-        for val in domains[v]:
+        for val in ordered_values(v):
             assignment[v] = val
             if consistent_with_local(v, assignment):
                 # forward check
@@ -118,3 +152,108 @@ def solve_backtracking(csp: CSP, var_order: Optional[List[str]]=None) -> Iterabl
     yield from backtrack(0)
 
 
+# ---------- Incremental session (warm start after edits) ----------
+class SolverSession:
+    """Holds a CSP plus its propagated domains so small edits can be re-solved cheaply.
+
+    Tightening edits (add_constraint, restrict_domain) re-propagate only the constraints
+    touching the edited variables; remove_constraint can loosen domains, so it re-propagates
+    from the unpruned domains. The last solution found is kept as a value-ordering hint.
+    """
+
+    def __init__(self, csp: CSP):
+        self.base_domains: Dict[str, List[Val]] = {v: list(ds) for v, ds in csp.domains.items()}
+        self.constraints: List[Constraint] = []
+        self.cons_by_var: Dict[str, List[Constraint]] = {v: [] for v in self.base_domains}
+        self.last_solution: Optional[Assignment] = None
+        for c in csp.constraints:
+            self._index(c)
+        self._reset()
+
+    def _index(self, c: Constraint) -> None:
+        for v in c.scope:
+            if v not in self.cons_by_var:
+                raise ValueError(f"Unknown variable {v} in {c.pretty}")
+        self.constraints.append(c)
+        for v in dict.fromkeys(c.scope):
+            self.cons_by_var[v].append(c)
+
+    def _reset(self) -> None:
+        self.domains: Dict[str, List[Val]] = {v: list(ds) for v, ds in self.base_domains.items()}
+        self.consistent = all(self.domains.values())
+        self._propagate(self.constraints)
+
+    def _propagate(self, queue_init: Iterable[Constraint]) -> bool:
+        """Prune values that conflict with singleton-domain variables, to a fixpoint."""
+        queue = deque(queue_init)
+        queued = {id(c) for c in queue}
+        while queue and self.consistent:
+            c = queue.popleft()
+            queued.discard(id(c))
+            fixed = {v: self.domains[v][0] for v in c.scope if len(self.domains[v]) == 1}
+            if not c.pred(fixed):
+                self.consistent = False
+                break
+            for w in dict.fromkeys(c.scope):
+                if w in fixed:
+                    continue
+                kept = [val for val in self.domains[w] if c.pred({**fixed, w: val})]
+                if len(kept) == len(self.domains[w]):
+                    continue
+                self.domains[w] = kept
+                if not kept:
+                    self.consistent = False
+                    break
+                if len(kept) == 1:
+                    # w is now fixed: wake up everything that mentions it
+                    for d in self.cons_by_var[w]:
+                        if id(d) not in queued:
+                            queue.append(d); queued.add(id(d))
+        return self.consistent
+
+    def add_constraint(self, c: Constraint) -> Constraint:
+        self._index(c)
+        self._propagate([c])
+        return c
+
+    def remove_constraint(self, c: Constraint) -> None:
+        for i, d in enumerate(self.constraints):
+            if d is c:
+                del self.constraints[i]
+                break
+        else:
+            raise ValueError(f"Constraint not in session: {c.pretty}")
+        # drop a single entry per variable, matching the single entry dropped above
+        for v in dict.fromkeys(c.scope):
+            bucket = self.cons_by_var[v]
+            del bucket[next(i for i, d in enumerate(bucket) if d is c)]
+        self._reset()
+
+    def restrict_domain(self, var: str, allowed: Iterable[Val]) -> None:
+        if var not in self.base_domains:
+            raise ValueError(f"Unknown variable {var}")
+        allowed_set = set(allowed)
+        self.base_domains[var] = [x for x in self.base_domains[var] if x in allowed_set]
+        kept = [x for x in self.domains[var] if x in allowed_set]
+        if len(kept) == len(self.domains[var]):
+            return
+        self.domains[var] = kept
+        if not kept:
+            self.consistent = False
+        elif len(kept) == 1:
+            self._propagate(self.cons_by_var[var])
+
+    def solutions(self) -> Iterable[Assignment]:
+        if not self.consistent:
+            return
+        # fixed variables first, then smallest domains; ties keep declaration order
+        order = sorted(self.domains, key=lambda v: len(self.domains[v]))
+        csp = CSP(domains=self.domains, constraints=self.constraints)
+        yield from solve_backtracking(csp, order, value_hint=self.last_solution)
+
+    def solve(self) -> Optional[Assignment]:
+        """First solution under the current model; it becomes the hint for the next solve."""
+        sol = next(iter(self.solutions()), None)
+        if sol is not None:
+            self.last_solution = sol
+        return sol
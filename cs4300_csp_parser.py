@@ -1,15 +1,16 @@
 from __future__ import annotations
-import re, ast
+import re, ast, operator
 from typing import Dict, List, Tuple
 from cs4300_csp import CSP, c_alldiff, c_bin, c_in, c_sum, c_table, c_add10
 
+# operator.* (not lambdas) so c_bin can record the constraint kind
 BINOPS = {
-    "eq":  ("==", lambda x,y: x == y),
-    "neq": ("!=", lambda x,y: x !=  y),
-    "lt":  ("<",  lambda x,y: x <   y),
-    "le":  ("<=", lambda x,y: x <=  y),
-    "gt":  (">",  lambda x,y: x >   y),
-    "ge":  (">=", lambda x,y: x >=  y),
+    "eq":  ("==", operator.eq),
+    "neq": ("!=", operator.ne),
+    "lt":  ("<",  operator.lt),
+    "le":  ("<=", operator.le),
+    "gt":  (">",  operator.gt),
+    "ge":  (">=", operator.ge),
 }
 
 def _clean(lines: List[str]) -> List[str]:
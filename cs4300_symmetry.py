@@ -0,0 +1,276 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import permutations
+from math import factorial, prod
+from typing import Dict, List, Tuple, Iterable, Optional
+import operator
+from cs4300_csp import CSP, Constraint, Assignment, Val, c_bin, c_precede, solve_backtracking
+
+# Constraint kinds (Constraint.kind, set by the cs4300_csp builders) that we can reason about.
+UNORDERED_KINDS = {"alldiff", "eq", "neq", "sum"}      # scope order irrelevant
+ORDERED_KINDS = {"lt", "le", "table", "add10"}         # scope order matters
+FLIPPED_KINDS = {"gt": "lt", "ge": "le"}               # gt(x,y) == lt(y,x)
+VALUE_SYMMETRIC_KINDS = {"alldiff", "eq", "neq"}       # unchanged by renaming values
+
+@dataclass
+class Symmetries:
+    """Interchangeable variables and values found in a CSP.
+
+    order is the variable order the lex-leader breaking constraints are stated in
+    (declaration order); each class is listed in that order / ascending.
+    """
+    order: List[str]
+    var_classes: List[List[str]] = field(default_factory=list)
+    value_classes: List[List[Val]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.var_classes or self.value_classes)
+
+# ---------- Detection ----------
+def _tail(c: Constraint) -> str:
+    # non-variable part of a builder's pretty, e.g. " == 15" for sum or " allowed [...]" for table
+    return c.pretty.split(")", 1)[1] if ")" in c.pretty else ""
+
+def _key(c: Constraint, m: Dict[str, str]):
+    """Structural key of c with variables renamed by m; equal keys mean equal constraints."""
+    kind = c.kind
+    scope = tuple(m.get(v, v) for v in c.scope)
+    if kind in FLIPPED_KINDS and len(scope) == 2:
+        return (FLIPPED_KINDS[kind], scope[::-1], _tail(c))
+    if kind in UNORDERED_KINDS:
+        return (kind, tuple(sorted(scope)), _tail(c))
+    if kind in ORDERED_KINDS:
+        return (kind, scope, _tail(c))
+    # opaque predicate: only equal to itself on the same scope
+    return (id(c), scope)
+
+def _is_unary(c: Constraint) -> bool:
+    return len(set(c.scope)) == 1
+
+def _folded_domains(csp: CSP) -> Dict[str, List[Val]]:
+    """Domains with unary constraints applied, so they can be ignored afterwards."""
+    domains = {v: list(ds) for v, ds in csp.domains.items()}
+    for c in csp.constraints:
+        if _is_unary(c) and c.scope[0] in domains:
+            v = c.scope[0]
+            domains[v] = [val for val in domains[v] if c.pred({v: val})]
+    return domains
+
+def _value_classes(csp: CSP, domains: Dict[str, List[Val]]) -> List[List[Val]]:
+    # Values touching a variable under a non value-symmetric constraint can't be renamed.
+    tainted = set()
+    for c in csp.constraints:
+        if not _is_unary(c) and c.kind not in VALUE_SYMMETRIC_KINDS:
+            for v in c.scope:
+                tainted.update(domains.get(v, ()))
+    # Otherwise two values are interchangeable iff exactly the same variables can take them.
+    holders: Dict[Val, List[str]] = {}
+    for v, ds in domains.items():
+        for val in ds:
+            holders.setdefault(val, []).append(v)
+    groups: Dict[Tuple[str, ...], List[Val]] = {}
+    for val, vs in holders.items():
+        if val not in tainted:
+            groups.setdefault(tuple(vs), []).append(val)
+    return [sorted(g) for g in groups.values() if len(g) > 1]
+
+def _var_classes(csp: CSP, domains: Dict[str, List[Val]]) -> List[List[str]]:
+    cons_by_var: Dict[str, List[Constraint]] = {v: [] for v in domains}
+    for c in csp.constraints:
+        if not _is_unary(c):
+            for v in dict.fromkeys(c.scope):
+                # undeclared scope vars are never assigned; skip them like solve_backtracking
+                if v in cons_by_var:
+                    cons_by_var[v].append(c)
+
+    def swappable(x: str, y: str) -> bool:
+        touched = {id(c): c for c in cons_by_var[x] + cons_by_var[y]}.values()
+        before = Counter(_key(c, {}) for c in touched)
+        after = Counter(_key(c, {x: y, y: x}) for c in touched)
+        return before == after
+
+    # Transpositions compose, so pairwise swaps are enough to build full classes.
+    classes: List[List[str]] = []
+    for v in domains:
+        for cls in classes:
+            head = cls[0]
+            if (sorted(domains[head]) == sorted(domains[v])
+                    and len(cons_by_var[head]) == len(cons_by_var[v])
+                    and swappable(head, v)):
+                cls.append(v)
+                break
+        else:
+            classes.append([v])
+    return [cls for cls in classes if len(cls) > 1]
+
+def detect_symmetries(csp: CSP) -> Symmetries:
+    """Find interchangeable variables and values from the constraint hypergraph.
+
+    Only whole-class interchangeability is detected; structured symmetries such as
+    Sudoku row/band swaps are not.
+    """
+    domains = _folded_domains(csp)
+    return Symmetries(order=list(csp.domains),
+                      var_classes=_var_classes(csp, domains),
+                      value_classes=_value_classes(csp, domains))
+
+# ---------- Breaking ----------
+def breaking_constraints(sym: Symmetries) -> List[Constraint]:
+    """Lex-leader constraints: interchangeable vars are non-decreasing, and
+       interchangeable values first appear in ascending order (value precedence)."""
+    out: List[Constraint] = []
+    for cls in sym.var_classes:
+        for x, y in zip(cls, cls[1:]):
+            out.append(c_bin(operator.le, x, y, "le"))
+    for vals in sym.value_classes:
+        out.append(c_precede(sym.order, vals))
+    return out
+
+def break_symmetries(csp: CSP, sym: Optional[Symmetries]=None) -> CSP:
+    sym = sym if sym is not None else detect_symmetries(csp)
+    return CSP(domains=csp.domains, constraints=csp.constraints + breaking_constraints(sym))
+
+def _relabel_values(a: Assignment, sym: Symmetries) -> Assignment:
+    # lex-least value renaming: class values get handed out in order of first appearance
+    out = dict(a)
+    for vals in sym.value_classes:
+        members = set(vals)
+        mapping: Dict[Val, Val] = {}
+        for v in sym.order:
+            if a[v] in members and a[v] not in mapping:
+                mapping[a[v]] = vals[len(mapping)]
+        for v in sym.order:
+            if a[v] in mapping:
+                out[v] = mapping[a[v]]
+    return out
+
+def _sort_vars(a: Assignment, sym: Symmetries) -> Assignment:
+    out = dict(a)
+    for cls in sym.var_classes:
+        for v, val in zip(cls, sorted(a[v] for v in cls)):
+            out[v] = val
+    return out
+
+def _distinct_orderings(vals: List[Val]) -> Iterable[Tuple[Val, ...]]:
+    """Distinct permutations of a multiset, each yielded once (lexicographic next-permutation)."""
+    cur = sorted(vals)
+    while True:
+        yield tuple(cur)
+        i = len(cur) - 2
+        while i >= 0 and cur[i] >= cur[i+1]:
+            i -= 1
+        if i < 0:
+            return
+        j = len(cur) - 1
+        while cur[j] <= cur[i]:
+            j -= 1
+        cur[i], cur[j] = cur[j], cur[i]
+        cur[i+1:] = reversed(cur[i+1:])
+
+def _var_images(a: Assignment, sym: Symmetries, i: int=0) -> Iterable[Assignment]:
+    # distinct images only: reorder each class's values, not its variables
+    # (recursive rather than itertools.product, which would materialise every ordering)
+    if i == len(sym.var_classes):
+        yield a
+        return
+    cls = sym.var_classes[i]
+    for vals in _distinct_orderings([a[v] for v in cls]):
+        b = dict(a)
+        b.update(zip(cls, vals))
+        yield from _var_images(b, sym, i+1)
+
+def _value_images(a: Assignment, sym: Symmetries) -> Iterable[Assignment]:
+    """Distinct value renamings of a: only the class values a actually uses are mapped."""
+    present = set(a.values())
+    used = [[val for val in vals if val in present] for vals in sym.value_classes]
+
+    def rename(i: int, mapping: Dict[Val, Val]) -> Iterable[Assignment]:
+        if i == len(used):
+            yield {v: mapping.get(val, val) for v, val in a.items()}
+            return
+        for targets in permutations(sym.value_classes[i], len(used[i])):
+            yield from rename(i+1, {**mapping, **dict(zip(used[i], targets))})
+
+    yield from rename(0, {})
+
+def _value_columns(a: Assignment, sym: Symmetries) -> List[Dict[Val, Tuple[int, ...]]]:
+    """Per value class: each value's count in every var class (and every other var).
+
+    Class values with equal columns are interchangeable up to reordering variables,
+    so renaming them among themselves cannot change _sort_vars of the result.
+    """
+    classed = {v for cls in sym.var_classes for v in cls}
+    blocks = sym.var_classes + [[v] for v in sym.order if v not in classed]
+    counts = [Counter(a[v] for v in b) for b in blocks]
+    return [{u: tuple(cnt[u] for cnt in counts) for u in vals} for vals in sym.value_classes]
+
+def _arrangements(items: Iterable) -> int:
+    """Number of distinct orderings of a multiset."""
+    mult = Counter(items)
+    return factorial(sum(mult.values())) // prod(factorial(m) for m in mult.values())
+
+def _column_images(a: Assignment, sym: Symmetries,
+                   columns: List[Dict[Val, Tuple[int, ...]]]) -> Iterable[Assignment]:
+    # one value renaming per distinct arrangement of columns onto each class's values
+    def rename(i: int, mapping: Dict[Val, Val]) -> Iterable[Assignment]:
+        if i == len(columns):
+            yield {v: mapping.get(val, val) for v, val in a.items()}
+            return
+        vals = sym.value_classes[i]
+        by_col: Dict[Tuple[int, ...], List[Val]] = {}
+        for u in vals:
+            by_col.setdefault(columns[i][u], []).append(u)
+        for arrangement in _distinct_orderings([columns[i][u] for u in vals]):
+            pools = {col: iter(us) for col, us in by_col.items()}
+            m = {next(pools[col]): t for col, t in zip(arrangement, vals)}
+            yield from rename(i+1, {**mapping, **m})
+    yield from rename(0, {})
+
+def canonical_form(a: Assignment, sym: Symmetries) -> Assignment:
+    """Lex-least (in sym.order) member of a's symmetry class.
+
+    With both variable and value classes this enumerates the cheaper of: distinct
+    arrangements of value columns (see _value_columns), or distinct orderings of each
+    var class. That is 1 for e.g. a single alldiff, but can still grow factorially
+    when many values are told apart by the variables holding them.
+    """
+    def lex(x: Assignment):
+        return [x[v] for v in sym.order]
+    if not sym.var_classes:
+        return _relabel_values(a, sym)
+    if not sym.value_classes:
+        return _sort_vars(a, sym)
+    columns = _value_columns(a, sym)
+    value_side = prod(_arrangements(cols.values()) for cols in columns)
+    var_side = prod(_arrangements(a[v] for v in cls) for cls in sym.var_classes)
+    if value_side <= var_side:
+        return min((_sort_vars(b, sym) for b in _column_images(a, sym, columns)), key=lex)
+    return min((_relabel_values(b, sym) for b in _var_images(a, sym)), key=lex)
+
+def expand_solution(a: Assignment, sym: Symmetries) -> Iterable[Assignment]:
+    """Lazily yield every distinct assignment symmetric to a (a itself included)."""
+    # Value renamings that are variable reorderings of each other share a sorted form;
+    # expanding each sorted form once keeps the yielded images distinct.
+    sorted_forms = set()
+    for b in _value_images(a, sym):
+        s = _sort_vars(b, sym)
+        k = tuple(s[v] for v in sym.order)
+        if k in sorted_forms:
+            continue
+        sorted_forms.add(k)
+        yield from _var_images(s, sym)
+
+def solve_modulo_symmetry(csp: CSP, sym: Optional[Symmetries]=None) -> Iterable[Assignment]:
+    """One solution per symmetry class (its lex-leader).
+
+    When the CSP has both variable and value classes, the breaking constraints can let
+    several members of a class through, so every surviving solution is also checked
+    against canonical_form; see there for that cost, which is paid per survivor.
+    """
+    sym = sym if sym is not None else detect_symmetries(csp)
+    exact = not (sym.var_classes and sym.value_classes)
+    for sol in solve_backtracking(break_symmetries(csp, sym), sym.order):
+        # the breaking constraints alone are only complete for one kind of symmetry
+        if exact or canonical_form(sol, sym) == sol:
+            yield sol
@@ -1,14 +1,26 @@
 from cs4300_csp_parser import parse_cs4300
 from cs4300_csp import solve_backtracking
+from cs4300_symmetry import detect_symmetries, solve_modulo_symmetry
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python run_csp.py <problem.csp>")
+    args = sys.argv[1:]
+    modulo = "--modulo-symmetry" in args
+    if modulo:
+        args.remove("--modulo-symmetry")
+    if len(args) != 1:
+        print("Usage: python run_csp.py [--modulo-symmetry] <problem.csp>")
         sys.exit(1)
-    csp = parse_cs4300(sys.argv[1])
+    csp = parse_cs4300(args[0])
+    if modulo:
+        sym = detect_symmetries(csp)
+        print(f"Interchangeable variables: {sym.var_classes}")
+        print(f"Interchangeable values: {sym.value_classes}")
+        sols = solve_modulo_symmetry(csp, sym)
+    else:
+        sols = solve_backtracking(csp)
     any_sol = False
-    for i, sol in enumerate(solve_backtracking(csp), 1):
+    for i, sol in enumerate(sols, 1):
         any_sol = True
         print(f"Solution #{i}: {sol}")
     if not any_sol:
@@ -0,0 +1,71 @@
+import operator
+from cs4300_csp import CSP, SolverSession, c_alldiff, c_bin, c_in, solve_backtracking
+
+
+def neq(x, y):
+    return c_bin(operator.ne, x, y, "neq")
+
+
+def chain():
+    return CSP({v: [1, 2, 3] for v in "ABC"}, [neq("A", "B"), neq("B", "C")])
+
+
+def cold_solutions(session):
+    # the session's model solved from scratch, from the unpruned domains
+    csp = CSP(domains=session.base_domains, constraints=list(session.constraints))
+    return [sorted(s.items()) for s in solve_backtracking(csp)]
+
+
+def warm_solutions(session):
+    return [sorted(s.items()) for s in session.solutions()]
+
+
+def test_add_then_remove_restores_domains():
+    s = SolverSession(chain())
+    s.restrict_domain("A", [1])
+    before = {v: sorted(ds) for v, ds in s.domains.items()}
+    c = s.add_constraint(neq("A", "C"))
+    assert s.domains["C"] == [2, 3]
+    assert sorted(warm_solutions(s)) == sorted(cold_solutions(s))
+    s.remove_constraint(c)
+    assert {v: sorted(ds) for v, ds in s.domains.items()} == before
+    assert sorted(warm_solutions(s)) == sorted(cold_solutions(s))
+
+
+def test_duplicate_constraint_removed_once_still_propagates():
+    s = SolverSession(chain())
+    c = neq("A", "C")
+    s.add_constraint(c)
+    s.add_constraint(c)
+    s.remove_constraint(c)
+    s.restrict_domain("A", [1])
+    assert 1 not in s.domains["C"]
+    assert sorted(warm_solutions(s)) == sorted(cold_solutions(s))
+
+
+def test_restrict_to_singleton_propagates():
+    s = SolverSession(CSP({v: [1, 2, 3] for v in "ABC"}, [c_alldiff(["A", "B", "C"])]))
+    s.restrict_domain("A", [2])
+    s.restrict_domain("B", [3])
+    assert s.domains == {"A": [2], "B": [3], "C": [1]}
+    assert warm_solutions(s) == cold_solutions(s)
+
+
+def test_restrict_to_empty_is_inconsistent():
+    s = SolverSession(chain())
+    s.restrict_domain("B", [])
+    assert s.consistent is False
+    assert s.solve() is None
+    assert cold_solutions(s) == []
+
+
+def test_previous_solution_is_tried_first():
+    s = SolverSession(chain())
+    c = s.add_constraint(c_in("A", [3]))
+    first = s.solve()
+    assert first["A"] == 3
+    # loosening edit: a cold solve now starts with A=1, the warm one keeps the old solution
+    s.remove_constraint(c)
+    assert cold_solutions(s)[0] != sorted(first.items())
+    assert sorted(first.items()) in cold_solutions(s)
+    assert s.solve() == first
@@ -0,0 +1,79 @@
+import operator
+from itertools import product
+from cs4300_csp import CSP, c_alldiff, c_bin, c_in, c_precede, c_sum, solve_backtracking
+from cs4300_symmetry import canonical_form, detect_symmetries, expand_solution, solve_modulo_symmetry
+
+
+def neq(x, y):
+    return c_bin(operator.ne, x, y, "neq")
+
+
+def brute_force(csp):
+    names = list(csp.domains)
+    for vals in product(*(csp.domains[v] for v in names)):
+        a = dict(zip(names, vals))
+        if all(c.pred(a) for c in csp.constraints):
+            yield a
+
+
+def key(a, order):
+    return tuple(a[v] for v in order)
+
+
+TINY_CSPS = {
+    "free": CSP({v: [1, 2, 3] for v in "XYZ"}, []),
+    "coloring": CSP({v: [1, 2, 3] for v in "ABCDE"},
+                    [neq("A", "B"), neq("B", "C"), neq("A", "C"), neq("A", "D"), neq("A", "E")]),
+    "sum": CSP({v: [1, 2, 3, 4] for v in "XYZW"}, [c_sum(list("XYZ"), "==", 6), neq("Z", "W")]),
+    "mixed": CSP({v: [0, 1, 2] for v in "ABCD"},
+                 [neq("A", "B"), neq("C", "D"), c_bin(operator.eq, "A", "C", "eq"), c_in("D", [0, 1])]),
+    "latin3": CSP({f"r{r}c{c}": [1, 2, 3] for r in range(3) for c in range(3)},
+                  [c_alldiff([f"r{r}c{c}" for c in range(3)]) for r in range(3)]
+                  + [c_alldiff([f"r{r}c{c}" for r in range(3)]) for c in range(3)]),
+}
+
+
+def test_one_solution_per_orbit_and_expansion_is_exact():
+    for name, csp in TINY_CSPS.items():
+        sym = detect_symmetries(csp)
+        assert sym, name
+        full = {key(a, sym.order) for a in brute_force(csp)}
+        canon = list(solve_modulo_symmetry(csp, sym))
+        images = [key(b, sym.order) for a in canon for b in expand_solution(a, sym)]
+        # every image is a real solution, orbits are disjoint, and together they cover everything
+        assert len(images) == len(set(images)), name
+        assert set(images) == full, name
+        # each survivor is the lex-leader of its orbit
+        for a in canon:
+            assert canonical_form(a, sym) == a, name
+
+
+def test_opaque_c_bin_has_no_symmetry():
+    csp = CSP({"x": [0, 1, 2], "y": [0, 1, 2]}, [c_bin(lambda a, b: a + b == 2, "x", "y", "eq")])
+    sym = detect_symmetries(csp)
+    assert not sym.value_classes
+    assert len(list(solve_modulo_symmetry(csp, sym))) == 3
+
+
+def test_precede_on_partial_prefix():
+    c = c_precede(["a", "b", "c"], [1, 2])
+    assert not c.pred({"a": 2})
+    assert c.pred({"b": 2})             # a still unassigned, could take 1
+    assert not c.pred({"a": 3, "b": 2})
+    assert c.pred({"a": 1, "c": 2})
+
+
+def test_single_alldiff_has_one_class():
+    names = [f"v{i}" for i in range(9)]
+    csp = CSP({v: list(range(1, 10)) for v in names}, [c_alldiff(names)])
+    sym = detect_symmetries(csp)
+    assert sym.var_classes == [names] and sym.value_classes == [list(range(1, 10))]
+    assert list(solve_modulo_symmetry(csp, sym)) == [dict(zip(names, range(1, 10)))]
+
+
+def test_undeclared_scope_variable_is_ignored():
+    csp = CSP({"a": [1, 2], "b": [1, 2]}, [c_alldiff(["a", "zz"]), c_in("zz", [1])])
+    sym = detect_symmetries(csp)
+    assert sym.var_classes == [] and sym.value_classes == [[1, 2]]
+    expanded = {key(b, sym.order) for a in solve_modulo_symmetry(csp, sym) for b in expand_solution(a, sym)}
+    assert expanded == {key(a, sym.order) for a in solve_backtracking(csp)}